@@ -1,6 +1,6 @@
 from taipy.gui import Gui, State, navigate
 import pandas as pd
-from utils import get_stock_data, calculate_metrics, create_price_chart, format_number, get_stock_news
+from utils import fetch_all, calculate_metrics, create_price_chart, format_number_vec
 from datetime import datetime
 
 # Default Indian and US stocks
@@ -84,19 +84,24 @@ initial_state = {
 
 def submit_analysis(state: State):
     """Handle submit button click"""
-    hist_data, stock_info = get_stock_data(state.selected_stock, state.time_period)
+    hist_data, stock_info, news_df = fetch_all(state.selected_stock, state.time_period)
     
     if hist_data is not None and stock_info is not None:
         # Calculate metrics
         df = calculate_metrics(hist_data)
         
         # Update state with new data
-        state.current_price = f"${format_number(stock_info.get('currentPrice', 0))}"
+        current_price, market_cap, volume = format_number_vec([
+            stock_info.get('currentPrice', 0),
+            stock_info.get('marketCap', 0),
+            stock_info.get('volume', 0)
+        ])
+        state.current_price = f"${current_price}"
         change = stock_info.get('regularMarketChangePercent', 0)
         state.price_change = f"{change:.2f}%"
         state.change_class = "positive" if change >= 0 else "negative"
-        state.market_cap = f"${format_number(stock_info.get('marketCap', 0))}"
-        state.volume = format_number(stock_info.get('volume', 0))
+        state.market_cap = f"${market_cap}"
+        state.volume = volume
         
         # Create chart
         state.chart = create_price_chart(df, state.selected_stock)
@@ -104,17 +109,17 @@ def submit_analysis(state: State):
         # Create metrics dataframe
         state.metrics_df = pd.DataFrame({
             'Metric': ['P/E Ratio', 'EPS', '52 Week High', '52 Week Low', 'Beta'],
-            'Value': [
-                format_number(stock_info.get('trailingPE', 0)),
-                format_number(stock_info.get('trailingEps', 0)),
-                format_number(stock_info.get('fiftyTwoWeekHigh', 0)),
-                format_number(stock_info.get('fiftyTwoWeekLow', 0)),
-                format_number(stock_info.get('beta', 0))
-            ]
+            'Value': format_number_vec([
+                stock_info.get('trailingPE', 0),
+                stock_info.get('trailingEps', 0),
+                stock_info.get('fiftyTwoWeekHigh', 0),
+                stock_info.get('fiftyTwoWeekLow', 0),
+                stock_info.get('beta', 0)
+            ])
         })
         
-        # Get news
-        state.news_items = get_stock_news(state.selected_stock)
+        # News was fetched alongside the price data
+        state.news_items = news_df
         
         # Navigate to analysis page
         navigate(state, "analysis")
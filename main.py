@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-from utils import get_stock_data, calculate_metrics, create_price_chart, format_number, get_stock_news, get_company_profile, get_financial_metrics
+import numpy as np
+from utils import fetch_all, calculate_metrics, create_price_chart, format_number, format_number_vec, get_company_profile, get_financial_metrics
 from datetime import datetime, timedelta
 
 # Page configuration
@@ -39,6 +40,11 @@ default_stocks = [
     'AXISBANK.NS'     # Axis Bank
 ]
 
+# Home page stock grid, four names per row
+stock_names = [stock.replace('.NS', '') for stock in default_stocks]
+stock_names += [''] * (-len(stock_names) % 4)
+stock_grid = pd.DataFrame(np.array(stock_names).reshape(-1, 4))
+
 # Initialize session state variables
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 'home'
@@ -58,9 +64,9 @@ def show_analysis(selected_stock, time_period):
         if time_period == 'custom':
             start_date = st.session_state.custom_start_date.strftime('%Y-%m-%d')
             end_date = st.session_state.custom_end_date.strftime('%Y-%m-%d')
-            hist_data, stock_info = get_stock_data(selected_stock, 'custom', start_date, end_date)
+            hist_data, stock_info, news_df = fetch_all(selected_stock, 'custom', start_date, end_date)
         else:
-            hist_data, stock_info = get_stock_data(selected_stock, time_period)
+            hist_data, stock_info, news_df = fetch_all(selected_stock, time_period)
 
         if hist_data is not None and stock_info is not None:
             # Calculate metrics
@@ -79,6 +85,11 @@ def show_analysis(selected_stock, time_period):
                 st.plotly_chart(create_price_chart(df, selected_stock), use_container_width=True)
 
                 # Summary metrics in a single row
+                current_price, year_high, year_low = format_number_vec([
+                    stock_info.get('currentPrice', 0),
+                    stock_info.get('fiftyTwoWeekHigh', 0),
+                    stock_info.get('fiftyTwoWeekLow', 0)
+                ])
                 col1, col2, col3, col4 = st.columns(4)
 
                 with col1:
@@ -86,7 +97,7 @@ def show_analysis(selected_stock, time_period):
                     <div class="stock-metric">
                         Current Price
                         <br/>
-                        <span class="indicator-up">₹{format_number(stock_info.get('currentPrice', 0))}</span>
+                        <span class="indicator-up">₹{current_price}</span>
                     </div>
                     """, unsafe_allow_html=True)
 
@@ -106,7 +117,7 @@ def show_analysis(selected_stock, time_period):
                     <div class="stock-metric">
                         52 Week High
                         <br/>
-                        <span>₹{format_number(stock_info.get('fiftyTwoWeekHigh', 0))}</span>
+                        <span>₹{year_high}</span>
                     </div>
                     """, unsafe_allow_html=True)
 
@@ -115,7 +126,7 @@ def show_analysis(selected_stock, time_period):
                     <div class="stock-metric">
                         52 Week Low
                         <br/>
-                        <span>₹{format_number(stock_info.get('fiftyTwoWeekLow', 0))}</span>
+                        <span>₹{year_low}</span>
                     </div>
                     """, unsafe_allow_html=True)
 
@@ -221,17 +232,14 @@ def show_analysis(selected_stock, time_period):
 
             with tab4:
                 # News Section
-                news_df = get_stock_news(selected_stock)
                 if not news_df.empty:
-                    for _, row in news_df.iterrows():
-                        st.markdown(f"""
-                        <div class="news-item">
-                            <h4>{row['Title']}</h4>
-                            <p>{row['Date']}</p>
-                            <a href="{row['Link']}" target="_blank">Read More</a>
-                        </div>
-                        <hr>
-                        """, unsafe_allow_html=True)
+                    news_html = (
+                        '<div class="news-item"><h4>' + news_df['Title'] +
+                        '</h4><p>' + news_df['Date'] +
+                        '</p><a href="' + news_df['Link'] +
+                        '" target="_blank">Read More</a></div><hr>'
+                    ).str.cat(sep='')
+                    st.markdown(news_html, unsafe_allow_html=True)
                 else:
                     st.info("No recent news available")
         else:
@@ -328,10 +336,7 @@ else:
 
     # Display available stocks in a grid
     st.subheader("Available Stocks")
-    cols = st.columns(4)
-    for i, stock in enumerate(default_stocks):
-        company_name = stock.replace('.NS', '')
-        cols[i % 4].markdown(f"• {company_name}")
+    st.table(stock_grid, hide_index=True, hide_header=True)
 
 # Footer
 st.markdown("""
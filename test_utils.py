@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from utils import INDICATOR_COLUMNS, calculate_metrics, format_number, format_number_vec, lttb
+
+
+def reference_metrics(df):
+    """The original pandas implementation of calculate_metrics"""
+    df = df.copy()
+    df['SMA_20'] = df['Close'].rolling(window=20).mean()
+    df['SMA_50'] = df['Close'].rolling(window=50).mean()
+
+    delta = df['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    df['RSI'] = 100 - (100 / (1 + gain / loss))
+
+    exp1 = df['Close'].ewm(span=12, adjust=False).mean()
+    exp2 = df['Close'].ewm(span=26, adjust=False).mean()
+    df['MACD'] = exp1 - exp2
+    df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
+
+    df['BB_middle'] = df['Close'].rolling(window=20).mean()
+    df['BB_upper'] = df['BB_middle'] + 2 * df['Close'].rolling(window=20).std()
+    df['BB_lower'] = df['BB_middle'] - 2 * df['Close'].rolling(window=20).std()
+    return df
+
+
+def price_history(n, nan_rows=()):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    close[list(nan_rows)] = np.nan
+    return pd.DataFrame(
+        {'Close': close.astype(np.float32)},
+        index=pd.date_range('2020-01-01', periods=n)
+    )
+
+
+class CalculateMetricsTest(unittest.TestCase):
+    def assert_matches_reference(self, df):
+        expected = reference_metrics(df.astype(np.float64))
+        actual = calculate_metrics(df.copy())
+        for column in INDICATOR_COLUMNS:
+            with self.subTest(column=column):
+                np.testing.assert_allclose(
+                    actual[column].to_numpy(dtype=np.float64),
+                    expected[column].to_numpy(),
+                    rtol=1e-4, atol=1e-3
+                )
+
+    def test_matches_reference(self):
+        self.assert_matches_reference(price_history(1500))
+
+    def test_single_nan_only_blanks_its_windows(self):
+        self.assert_matches_reference(price_history(1500, nan_rows=[300]))
+
+    def test_leading_and_consecutive_nans(self):
+        self.assert_matches_reference(price_history(500, nan_rows=[0, 1, 2, 200, 201, 202]))
+
+    def test_empty_history(self):
+        actual = calculate_metrics(price_history(0))
+        self.assertEqual(list(actual.columns), ['Close'] + INDICATOR_COLUMNS)
+
+
+class LttbTest(unittest.TestCase):
+    def test_keeps_endpoints_in_order(self):
+        close = price_history(5000, nan_rows=[10, 2500])['Close'].to_numpy()
+        positions = lttb(np.arange(len(close)), close, 1500)
+        self.assertEqual(len(positions), 1500)
+        self.assertEqual(positions[0], 0)
+        self.assertEqual(positions[-1], len(close) - 1)
+        self.assertTrue(np.all(np.diff(positions) > 0))
+
+    def test_short_series_is_kept_whole(self):
+        np.testing.assert_array_equal(lttb(np.arange(10), np.ones(10), 20), np.arange(10))
+
+
+class FormatNumberVecTest(unittest.TestCase):
+    def assert_matches_scalar(self, numbers):
+        self.assertEqual(format_number_vec(numbers), [format_number(number) for number in numbers])
+
+    def test_numeric_batch(self):
+        self.assert_matches_scalar([
+            0, float('nan'), -5, -1500, -2.5e9, 999.999, 999999.995,
+            1234.5, 2.5e6, 3.75e9, float('inf'), float('-inf')
+        ])
+
+    def test_mixed_batch(self):
+        self.assert_matches_scalar([0, None, float('nan'), -1500, 999.999, '12.5', 'abc', 3.75e9])
+
+
+if __name__ == '__main__':
+    unittest.main()
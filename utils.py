@@ -4,54 +4,361 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 import trafilatura
-from datetime import datetime, timedelta
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    from numba import njit, types
+    # Under pandas copy-on-write to_numpy() returns read-only views, so the
+    # kernel signatures take read-only price arrays (writable ones convert)
+    _PRICES = types.Array(types.float32, 1, 'A', readonly=True)
+    _METRICS_SIGNATURE = types.void(_PRICES, types.float32[:, :])
+except ImportError:
+    # Numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+    _METRICS_SIGNATURE = None
+
+try:
+    import streamlit as st
+    _cache_data = st.cache_data
+    _cache_resource = st.cache_resource
+except ImportError:
+    # The Taipy front end (app.py) runs without Streamlit installed
+    def _cache_data(*args, **kwargs):
+        return lambda func: func
+    _cache_resource = _cache_data
+
+# Indicator parameters. Numba freezes module-level scalars into the
+# compiled kernels, so the EMA smoothing factors are derived once here.
+RSI_PERIOD = 14
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+MACD_FAST_SPAN = 12
+MACD_SLOW_SPAN = 26
+MACD_SIGNAL_SPAN = 9
+_ALPHA_FAST = 2.0 / (MACD_FAST_SPAN + 1)
+_ALPHA_SLOW = 2.0 / (MACD_SLOW_SPAN + 1)
+_ALPHA_SIGNAL = 2.0 / (MACD_SIGNAL_SPAN + 1)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Column order of the block filled by _metrics_kernel
+INDICATOR_COLUMNS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'Signal_Line', 'BB_middle', 'BB_upper', 'BB_lower']
+
+# Let LLVM contract and reassociate float math in the kernels, but keep NaN
+# and inf semantics since NaN marks each indicator's warm-up period
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Charts are drawn at most this wide, so longer histories are downsampled
+MAX_CHART_POINTS = 1500
+# Histories up to this many rows are plotted in full
+DOWNSAMPLE_THRESHOLD = 2000
+
+# yfinance memoizes info, news and fast_info on each Ticker, so a Ticker is
+# only shared for a short window or refetches would return stale quotes
+_TICKER_TTL = 60
+
+def _ticker(symbol):
+    """Reuse one yfinance Ticker per symbol for up to _TICKER_TTL seconds"""
+    return _ticker_for_window(symbol, int(time.time() // _TICKER_TTL))
+
+@lru_cache(maxsize=128)
+def _ticker_for_window(symbol, window):
+    return yf.Ticker(symbol)
+
+class FileCache:
+    """Pickle-backed on-disk cache whose entries expire after a TTL"""
+
+    def __init__(self, directory='.cache'):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, '_'.join(str(part) for part in key) + '.pkl')
+
+    def get(self, key, ttl):
+        """Return the cached value for key, or None if missing or expired"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                value, timestamp = pickle.load(f)
+        except Exception:
+            return None
+        if timestamp + ttl <= time.time():
+            return None
+        return value
+
+    def set(self, key, value):
+        """Store value under key, stamped with the current time"""
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump((value, time.time()), f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"Error writing cache: {str(e)}")
+
+_file_cache = FileCache()
+
+# Info carries the live quote (price, change, volume), so it expires quickly
+_INFO_TTL = 60
+
+def _cache_ttl(period):
+    """Intraday histories go stale quickly, longer ranges can be kept for a day"""
+    return 60 if period in ('1d', '5d') else 86400
 
 def get_stock_data(symbol, period='1y', start_date=None, end_date=None):
     """Fetch stock data using yfinance"""
-    try:
-        stock = yf.Ticker(symbol)
-        if period == 'custom' and start_date and end_date:
-            hist = stock.history(start=start_date, end=end_date)
-        else:
-            hist = stock.history(period=period)
-        info = stock.info
+    history_key = ('history', symbol, period, start_date, end_date)
+    info_key = ('info', symbol)
+    hist = _file_cache.get(history_key, _cache_ttl(period))
+    info = _file_cache.get(info_key, _INFO_TTL)
+    if hist is not None and info is not None:
         return hist, info
+
+    try:
+        # History and info are separate requests, so issue whatever is missing together
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if hist is None:
+                hist_future = executor.submit(_fetch_history, symbol, period, start_date, end_date)
+            if info is None:
+                info_future = executor.submit(lambda: _ticker(symbol).info)
+            if hist is None:
+                hist = hist_future.result()
+                if not hist.empty:
+                    # Single precision is plenty for prices and halves what the
+                    # indicator and chart code has to move around
+                    hist = hist.astype({column: np.float32 for column in OHLCV_COLUMNS})
+                    _file_cache.set(history_key, hist)
+            if info is None:
+                info = info_future.result()
+                if info:
+                    _file_cache.set(info_key, info)
     except Exception as e:
         print(f"Error fetching stock data: {str(e)}")
         return None, None
 
+    return hist, info
+
+def _fetch_history(symbol, period, start_date, end_date):
+    """Download price history for a predefined period or custom range"""
+    stock = _ticker(symbol)
+    if period == 'custom' and start_date and end_date:
+        return stock.history(start=start_date, end=end_date)
+    return stock.history(period=period)
+
+@_cache_data(ttl=60)
+def fetch_all(symbol, period='1y', start_date=None, end_date=None):
+    """Fetch price history, company info and latest news concurrently"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        data_future = executor.submit(get_stock_data, symbol, period, start_date, end_date)
+        news_future = executor.submit(get_stock_news, symbol)
+        hist, info = data_future.result()
+        return hist, info, news_future.result()
+
+def calculate_rsi(prices, period=RSI_PERIOD):
+    """Calculate Relative Strength Index"""
+    close = prices.to_numpy(dtype=np.float32)
+    out = np.full(len(close), np.nan, dtype=np.float32)
+    _rsi_kernel(close, period, out)
+    return pd.Series(out, index=prices.index)
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _rsi_kernel(close, period, out):
+    """Single-pass RSI over simple moving averages of gains and losses, written into out"""
+    n = close.shape[0]
+    sum_gain = 0.0
+    sum_loss = 0.0
+    for i in range(1, n):
+        # NaN deltas fail both comparisons and count as zero
+        delta = np.float64(close[i]) - close[i - 1]
+        if delta > 0:
+            sum_gain += delta
+        elif delta < 0:
+            sum_loss -= delta
+        # Drop the delta leaving the window, recomputed instead of stored
+        if i > period:
+            delta = np.float64(close[i - period]) - close[i - period - 1]
+            if delta > 0:
+                sum_gain -= delta
+            elif delta < 0:
+                sum_loss += delta
+        if i >= period - 1:
+            if sum_loss > 0:
+                out[i] = 100.0 - 100.0 / (1.0 + sum_gain / sum_loss)
+            elif sum_gain > 0:
+                out[i] = 100.0
+
 def calculate_metrics(df):
     """Calculate technical indicators"""
-    # Basic moving averages
-    df['SMA_20'] = df['Close'].rolling(window=20).mean()
-    df['SMA_50'] = df['Close'].rolling(window=50).mean()
+    close = df['Close'].to_numpy(dtype=np.float32)
 
-    # RSI
-    df['RSI'] = calculate_rsi(df['Close'])
+    # Moving averages, RSI, MACD and Bollinger Bands written by the kernel
+    # into one contiguous block, attached to df in one assignment
+    out = np.full((len(close), len(INDICATOR_COLUMNS)), np.nan, dtype=np.float32)
+    _metrics_kernel(close, out)
+    df[INDICATOR_COLUMNS] = out
 
-    # MACD
-    exp1 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp2 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = exp1 - exp2
-    df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    return df
 
-    # Bollinger Bands
-    df['BB_middle'] = df['Close'].rolling(window=20).mean()
-    df['BB_upper'] = df['BB_middle'] + 2 * df['Close'].rolling(window=20).std()
-    df['BB_lower'] = df['BB_middle'] - 2 * df['Close'].rolling(window=20).std()
+@njit(cache=True, fastmath=_FASTMATH)
+def _ema_step(value, ema, weight, alpha):
+    """One pandas ewm(adjust=False) update, NaN inputs carry the average forward"""
+    if np.isnan(ema):
+        # The average starts at the first observed value
+        return value, 1.0
+    # A skipped NaN still decays the old average's weight, like pandas does
+    weight *= 1.0 - alpha
+    if not np.isnan(value):
+        ema = (weight * ema + alpha * value) / (weight + alpha)
+        weight = 1.0
+    return ema, weight
 
-    return df
+@njit(_METRICS_SIGNATURE, cache=True, fastmath=_FASTMATH)
+def _metrics_kernel(close, out):
+    """Fill out's INDICATOR_COLUMNS from close, rows still warming up stay NaN"""
+    n = close.shape[0]
+    if n == 0:
+        return
 
-def calculate_rsi(prices, period=14):
-    """Calculate Relative Strength Index"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+    _rsi_kernel(close, RSI_PERIOD, out[:, 2])
+
+    sum_20 = 0.0
+    sum_sq_20 = 0.0
+    sum_50 = 0.0
+    nan_20 = 0
+    nan_50 = 0
+    ema_fast = np.nan
+    ema_slow = np.nan
+    ema_signal = np.nan
+    weight_fast = 1.0
+    weight_slow = 1.0
+    weight_signal = 1.0
+
+    for i in range(n):
+        # Accumulate in double precision, squares of float32 prices lose digits
+        x = np.float64(close[i])
+
+        # Sliding window sums for the moving averages and band width. NaN
+        # closes are counted rather than summed, so like pandas rolling they
+        # only blank the windows that contain them
+        if np.isnan(x):
+            nan_20 += 1
+            nan_50 += 1
+        else:
+            sum_20 += x
+            sum_sq_20 += x * x
+            sum_50 += x
+        if i >= 20:
+            old = np.float64(close[i - 20])
+            if np.isnan(old):
+                nan_20 -= 1
+            else:
+                sum_20 -= old
+                sum_sq_20 -= old * old
+        if i >= 50:
+            old = np.float64(close[i - 50])
+            if np.isnan(old):
+                nan_50 -= 1
+            else:
+                sum_50 -= old
+        if i >= 19 and nan_20 == 0:
+            mean = sum_20 / 20.0
+            variance = max((sum_sq_20 - sum_20 * mean) / 19.0, 0.0)
+            std = np.sqrt(variance)
+            out[i, 0] = mean
+            out[i, 5] = mean
+            out[i, 6] = mean + 2.0 * std
+            out[i, 7] = mean - 2.0 * std
+        if i >= 49 and nan_50 == 0:
+            out[i, 1] = sum_50 / 50.0
+
+        # MACD and signal line (exponential averages with adjust=False)
+        ema_fast, weight_fast = _ema_step(x, ema_fast, weight_fast, _ALPHA_FAST)
+        ema_slow, weight_slow = _ema_step(x, ema_slow, weight_slow, _ALPHA_SLOW)
+        macd_value = ema_fast - ema_slow
+        ema_signal, weight_signal = _ema_step(macd_value, ema_signal, weight_signal, _ALPHA_SIGNAL)
+        out[i, 3] = macd_value
+        out[i, 4] = ema_signal
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling, returns positions of the kept points"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # First and last points are always kept, the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    return _lttb_kernel(
+        np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), edges
+    )
+
+@njit(cache=True)
+def _lttb_kernel(x, y, edges):
+    """Pick one point per bucket between edges, keeping the first and last points"""
+    n = y.shape[0]
+    n_out = edges.shape[0] + 1
+    positions = np.empty(n_out, dtype=np.int64)
+    positions[0] = 0
+    positions[n_out - 1] = n - 1
+    selected = 0
+    for i in range(n_out - 2):
+        start = edges[i]
+        end = edges[i + 1]
+        if i + 2 < edges.shape[0]:
+            next_start = edges[i + 1]
+            next_end = edges[i + 2]
+        else:
+            next_start = n - 1
+            next_end = n
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(next_start, next_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= next_end - next_start
+        avg_y /= next_end - next_start
+
+        # Keep the point forming the largest triangle with the previous pick
+        # and the next bucket's average (NaN gaps fall back to the first point)
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs(
+                (x[selected] - avg_x) * (y[j] - y[selected])
+                - (x[selected] - x[j]) * (avg_y - y[selected])
+            )
+            if area > best_area:
+                best = j
+                best_area = area
+        selected = best
+        positions[i + 1] = selected
+    return positions
+
+def _downsample_positions(df, column):
+    """Row positions to plot for column, downsampled with LTTB on long histories"""
+    if len(df) <= DOWNSAMPLE_THRESHOLD:
+        return np.arange(len(df))
+    return lttb(np.arange(len(df)), df[column].to_numpy(), MAX_CHART_POINTS)
+
+def _trace_points(df, column, positions):
+    """x/y keyword arguments for a line trace of column at the given row positions"""
+    return dict(x=df.index[positions], y=df[column].to_numpy()[positions])
 
+# cache_resource hands back the same Figure instead of unpickling a copy on
+# every rerun, so callers must treat the returned chart as read-only
+@_cache_resource(max_entries=32)
 def create_price_chart(df, symbol):
     """Create an interactive price chart with indicators"""
+    # WebGL line traces render long histories much faster than SVG
+    scatter = go.Scattergl if len(df) > 500 else go.Scatter
+
+    # All line traces share the rows picked from Close, so the band fill
+    # and the overlays line up on the same x values
+    line_points = _downsample_positions(df, 'Close')
+
     # Create figure with secondary y-axis
     fig = make_subplots(
         rows=3, 
@@ -77,9 +384,8 @@ def create_price_chart(df, symbol):
 
     # Bollinger Bands with reduced opacity
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['BB_upper'],
+        scatter(
+            **_trace_points(df, 'BB_upper', line_points),
             name='Upper Band',
             line=dict(color='rgba(173, 204, 255, 0.3)'),
             showlegend=True
@@ -88,9 +394,8 @@ def create_price_chart(df, symbol):
     )
 
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['BB_lower'],
+        scatter(
+            **_trace_points(df, 'BB_lower', line_points),
             name='Lower Band',
             line=dict(color='rgba(173, 204, 255, 0.3)'),
             fill='tonexty',
@@ -102,9 +407,8 @@ def create_price_chart(df, symbol):
 
     # Moving averages with clearer colors
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['SMA_20'],
+        scatter(
+            **_trace_points(df, 'SMA_20', line_points),
             name='20-Day MA',
             line=dict(color='#00FF9D', width=1.5),
             showlegend=True
@@ -113,9 +417,8 @@ def create_price_chart(df, symbol):
     )
 
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['SMA_50'],
+        scatter(
+            **_trace_points(df, 'SMA_50', line_points),
             name='50-Day MA',
             line=dict(color='#FF4B4B', width=1.5),
             showlegend=True
@@ -124,13 +427,15 @@ def create_price_chart(df, symbol):
     )
 
     # Volume bars with improved colors
-    colors = ['#4BFF4B' if row['Close'] >= row['Open'] else '#FF4B4B' 
-              for index, row in df.iterrows()]
+    volume_points = _downsample_positions(df, 'Volume')
+    close = df['Close'].to_numpy()[volume_points]
+    open_ = df['Open'].to_numpy()[volume_points]
+    colors = np.where(close >= open_, '#4BFF4B', '#FF4B4B').tolist()
 
     fig.add_trace(
         go.Bar(
-            x=df.index,
-            y=df['Volume'],
+            x=df.index[volume_points],
+            y=df['Volume'].to_numpy()[volume_points],
             name='Volume',
             marker_color=colors,
             opacity=0.8,
@@ -141,9 +446,8 @@ def create_price_chart(df, symbol):
 
     # RSI with improved visualization
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['RSI'],
+        scatter(
+            **_trace_points(df, 'RSI', line_points),
             name='RSI',
             line=dict(color='#00FF9D', width=1.5),
             showlegend=True
@@ -153,21 +457,21 @@ def create_price_chart(df, symbol):
 
     # Add RSI levels with labels
     fig.add_hline(
-        y=70, 
+        y=RSI_OVERBOUGHT, 
         line_color='#FF4B4B', 
         line_width=1, 
         line_dash='dash',
-        annotation_text="Overbought (70)",
+        annotation_text=f"Overbought ({RSI_OVERBOUGHT})",
         annotation_position="right",
         row=3, col=1
     )
 
     fig.add_hline(
-        y=30, 
+        y=RSI_OVERSOLD, 
         line_color='#4BFF4B', 
         line_width=1, 
         line_dash='dash',
-        annotation_text="Oversold (30)",
+        annotation_text=f"Oversold ({RSI_OVERSOLD})",
         annotation_position="right",
         row=3, col=1
     )
@@ -215,7 +519,7 @@ def create_price_chart(df, symbol):
 def format_number(number):
     """Format large numbers with K, M, B suffixes"""
     try:
-        if pd.isna(number) or number == 0:
+        if pd.isna(number) or number == 0 or np.isinf(number):
             return "N/A"
         if number >= 1e9:
             return f"{number/1e9:.2f}B"
@@ -227,26 +531,43 @@ def format_number(number):
     except:
         return "N/A"
 
+def format_number_vec(numbers):
+    """Format a batch of numbers like format_number in one vectorized pass"""
+    values = np.asarray(numbers)
+    if values.dtype.kind not in 'biuf':
+        # None, strings and other non-numbers are N/A, as format_number's
+        # comparisons fail on them (numeric strings are not parsed)
+        values = [
+            number if isinstance(number, (int, float, np.integer, np.floating)) else np.nan
+            for number in numbers
+        ]
+    values = np.asarray(values, dtype=float)
+    conditions = [values >= 1e9, values >= 1e6, values >= 1e3]
+    scaled = np.select(conditions, [values / 1e9, values / 1e6, values / 1e3], values)
+    suffixes = np.select(conditions, ['B', 'M', 'K'], '')
+    formatted = np.char.add(np.char.mod('%.2f', scaled), suffixes)
+    return np.where(~np.isfinite(values) | (values == 0), 'N/A', formatted).tolist()
+
 def get_stock_news(symbol):
     """Get latest news for the stock"""
     try:
         company_symbol = symbol.replace('.NS', '')
-        stock = yf.Ticker(symbol)
+        stock = _ticker(symbol)
         news = stock.news
 
-        news_data = []
-        for item in news[:5]:  # Get latest 5 news items
-            news_data.append({
-                'Title': item['title'],
-                'Date': datetime.fromtimestamp(item['providerPublishTime']).strftime('%Y-%m-%d'),
-                'Link': item['link']
-            })
+        latest = news[:5]  # Get latest 5 news items
+        published = pd.to_datetime([item['providerPublishTime'] for item in latest], unit='s')
 
-        return pd.DataFrame(news_data)
+        return pd.DataFrame({
+            'Title': [item['title'] for item in latest],
+            'Date': published.strftime('%Y-%m-%d'),
+            'Link': [item['link'] for item in latest]
+        })
     except Exception as e:
         print(f"Error fetching news: {str(e)}")
         return pd.DataFrame(columns=['Title', 'Date', 'Link'])
 
+@_cache_data(max_entries=32)
 def get_company_profile(info):
     """Format company profile information"""
     profile = {
@@ -258,21 +579,37 @@ def get_company_profile(info):
     }
     return profile
 
+@_cache_data(max_entries=32)
 def get_financial_metrics(info):
     """Get key financial metrics"""
     currency_symbol = '₹' if '.NS' in info.get('symbol', '') else '$'
+    (market_cap, pe_ratio, eps, beta, dividend_yield, revenue, profit_margin,
+     operating_margin, roe, roa, debt_to_equity, current_ratio) = format_number_vec([
+        info.get('marketCap', 0),
+        info.get('trailingPE', 0),
+        info.get('trailingEps', 0),
+        info.get('beta', 0),
+        (info.get('dividendYield') or 0) * 100,
+        info.get('totalRevenue', 0),
+        (info.get('profitMargins') or 0) * 100,
+        (info.get('operatingMargins') or 0) * 100,
+        (info.get('returnOnEquity') or 0) * 100,
+        (info.get('returnOnAssets') or 0) * 100,
+        info.get('debtToEquity', 0),
+        info.get('currentRatio', 0),
+    ])
     metrics = {
-        'Market Cap': f"{currency_symbol}{format_number(info.get('marketCap', 0))}",
-        'P/E Ratio': format_number(info.get('trailingPE', 0)),
-        'EPS (TTM)': f"{currency_symbol}{format_number(info.get('trailingEps', 0))}",
-        'Beta': format_number(info.get('beta', 0)),
-        'Dividend Yield': f"{format_number(info.get('dividendYield', 0) * 100)}%" if info.get('dividendYield') else 'N/A',
-        'Revenue (TTM)': f"{currency_symbol}{format_number(info.get('totalRevenue', 0))}",
-        'Profit Margin': f"{format_number(info.get('profitMargins', 0) * 100)}%",
-        'Operating Margin': f"{format_number(info.get('operatingMargins', 0) * 100)}%",
-        'ROE': f"{format_number(info.get('returnOnEquity', 0) * 100)}%",
-        'ROA': f"{format_number(info.get('returnOnAssets', 0) * 100)}%",
-        'Debt to Equity': format_number(info.get('debtToEquity', 0)),
-        'Current Ratio': format_number(info.get('currentRatio', 0)),
+        'Market Cap': f"{currency_symbol}{market_cap}",
+        'P/E Ratio': pe_ratio,
+        'EPS (TTM)': f"{currency_symbol}{eps}",
+        'Beta': beta,
+        'Dividend Yield': f"{dividend_yield}%" if info.get('dividendYield') else 'N/A',
+        'Revenue (TTM)': f"{currency_symbol}{revenue}",
+        'Profit Margin': f"{profit_margin}%",
+        'Operating Margin': f"{operating_margin}%",
+        'ROE': f"{roe}%",
+        'ROA': f"{roa}%",
+        'Debt to Equity': debt_to_equity,
+        'Current Ratio': current_ratio,
     }
     return metrics
\ No newline at end of file